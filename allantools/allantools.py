@@ -106,10 +106,14 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
 import json
+import functools
 import numpy as np
 
 from scipy import interpolate
-from scipy.integrate import simps
+try:
+    from scipy.integrate import simpson
+except ImportError:  # scipy < 1.6
+    from scipy.integrate import simps as simpson
 # import scipy.stats # used in confidence_intervals()
 # import scipy.signal # decimation in lag-1 acf
 
@@ -219,50 +223,88 @@ def mdev(data, rate=1.0, data_type="phase", taus=None):
     """
     phase = input_to_phase(data, rate, data_type)
     (phase, ms, taus_used) = tau_generator(phase, rate, taus=taus)
-    data, taus = np.array(phase), np.array(taus)
 
-    md = np.zeros_like(ms)
-    mderr = np.zeros_like(ms)
-    ns = np.zeros_like(ms)
+    md = np.empty_like(taus_used)
+    mderr = np.empty_like(taus_used)
+    ns = np.empty_like(taus_used)
+    scratch = np.empty(len(phase))  # work array, shared by all taus
 
-    # this is a 'loop-unrolled' algorithm following
-    # http://www.leapsecond.com/tools/adev_lib.c
     for idx, m in enumerate(ms):
-        m = int(m)  # without this we get: VisibleDeprecationWarning:
-        # using a non-integer number instead of an integer
-        # will result in an error in the future
-        tau = taus_used[idx]
-
-        # First loop sum
-        d0 = phase[0:m]
-        d1 = phase[m:2*m]
-        d2 = phase[2*m:3*m]
-        e = min(len(d0), len(d1), len(d2))
-        v = np.sum(d2[:e] - 2*d1[:e] + d0[:e])
-        s = v * v
-
-        # Second part of sum
-        d3 = phase[3*m:]
-        d2 = phase[2*m:]
-        d1 = phase[1*m:]
-        d0 = phase[0:]
-
-        e = min(len(d0), len(d1), len(d2), len(d3))
-        n = e + 1
-
-        v_arr = v + np.cumsum(d3[:e] - 3 * d2[:e] + 3 * d1[:e] - d0[:e])
-
-        s = s + np.sum(v_arr * v_arr)
-        s /= 2.0 * m * m * tau * tau * n
-        s = np.sqrt(s)
-
-        md[idx] = s
-        mderr[idx] = (s / np.sqrt(n))
-        ns[idx] = n
+        (md[idx], mderr[idx], ns[idx]) = calc_mdev_phase(phase, rate, m,
+                                                         scratch)
 
     return remove_small_ns(taus_used, md, mderr, ns)
 
 
+def calc_mdev_phase(phase, rate, mj, scratch=None):
+    """  Main algorithm for mdev()
+
+        this is a 'loop-unrolled' algorithm following
+        http://www.leapsecond.com/tools/adev_lib.c
+
+    Parameters
+    ----------
+    phase: np.array
+        Phase data in seconds.
+    rate: float
+        The sampling rate for phase or frequency, in Hz
+    mj: int
+        averaging factor, tau = mj/rate
+    scratch: np.array, optional
+        Work array of at least len(phase) elements. Passing the same
+        array for every tau avoids a new allocation for each call.
+
+    Returns
+    -------
+    (dev, deverr, n): tuple
+        Array of computed values.
+
+    Notes
+    -----
+    The inner m-point sum of second differences is not recomputed for
+    each j. It is initialized once, and then updated with a running sum:
+    v(j+1) = v(j) + x(j+3m) - 3x(j+2m) + 3x(j+m) - x(j)
+    All v(j) are produced by a single cumsum(), and the sum of squares
+    by a single dot-product, without further temporary arrays.
+
+    NIST [SP1065]_ eqn (14), page 17.
+    """
+    mj = int(mj)
+    tau = mj / float(rate)
+
+    # First loop sum
+    d0 = phase[0:mj]
+    d1 = phase[mj:2*mj]
+    d2 = phase[2*mj:3*mj]
+    e = min(len(d0), len(d1), len(d2))
+    v = np.sum(d2[:e] - 2*d1[:e] + d0[:e])
+
+    # Second part of sum
+    d3 = phase[3*mj:]
+    d2 = phase[2*mj:]
+    d1 = phase[1*mj:]
+    d0 = phase[0:]
+    n = min(len(d0), len(d1), len(d2), len(d3)) + 1
+
+    # v_arr[0] is the first m-point sum, the rest are the running
+    # updates, so that cumsum() gives all the m-point sums v(j)
+    if scratch is None:
+        scratch = np.empty(n)
+    v_arr = scratch[:n]
+    v_arr[0] = v
+    np.subtract(d1[:n-1], d2[:n-1], out=v_arr[1:])
+    v_arr[1:] *= 3
+    v_arr[1:] += d3[:n-1]
+    v_arr[1:] -= d0[:n-1]
+    np.cumsum(v_arr, out=v_arr)
+
+    s = np.dot(v_arr, v_arr)
+    s /= 2.0 * mj * mj * tau * tau * n
+    s = np.sqrt(s)
+
+    return s, s / np.sqrt(n), n
+
+
 def adev(data, rate=1.0, data_type="phase", taus=None):
     """ Allan deviation.
         Classic - use only if required - relatively poor confidence.
@@ -320,17 +362,19 @@ def adev(data, rate=1.0, data_type="phase", taus=None):
     phase = input_to_phase(data, rate, data_type)
     (phase, m, taus_used) = tau_generator(phase, rate, taus)
 
-    ad = np.zeros_like(taus_used)
-    ade = np.zeros_like(taus_used)
-    adn = np.zeros_like(taus_used)
+    ad = np.empty_like(taus_used)
+    ade = np.empty_like(taus_used)
+    adn = np.empty_like(taus_used)
+    scratch = np.empty(len(phase))  # work array, shared by all taus
 
     for idx, mj in enumerate(m):  # loop through each tau value m(j)
-        (ad[idx], ade[idx], adn[idx]) = calc_adev_phase(phase, rate, mj, mj)
+        (ad[idx], ade[idx], adn[idx]) = calc_adev_phase(phase, rate, mj, mj,
+                                                        scratch)
 
     return remove_small_ns(taus_used, ad, ade, adn)
 
 
-def calc_adev_phase(phase, rate, mj, stride):
+def calc_adev_phase(phase, rate, mj, stride, scratch=None):
     """  Main algorithm for adev() (stride=mj) and oadev() (stride=1)
 
         see http://www.leapsecond.com/tools/adev_lib.c
@@ -346,6 +390,9 @@ def calc_adev_phase(phase, rate, mj, stride):
         M index value for stride
     stride: int
         Size of stride
+    scratch: np.array, optional
+        Work array of at least len(phase) elements. Passing the same
+        array for every tau avoids a new allocation for each call.
 
     Returns
     -------
@@ -371,13 +418,19 @@ def calc_adev_phase(phase, rate, mj, stride):
 
     n = min(len(d0), len(d1), len(d2))
 
+    # v_arr = d2 - 2*d1 + d0, computed in-place
+    if scratch is None:
+        scratch = np.empty(n)
+    v_arr = scratch[:n]
+    np.subtract(d2[:n], d1[:n], out=v_arr)
+    v_arr -= d1[:n]
+    v_arr += d0[:n]
+    s = np.dot(v_arr, v_arr)
+
     if n == 0:
         RuntimeWarning("Data array length is too small: %i" % len(phase))
         n = 1
 
-    v_arr = d2[:n] - 2 * d1[:n] + d0[:n]
-    s = np.sum(v_arr * v_arr)
-
     dev = np.sqrt(s / (2.0*n)) / mj*rate
     deverr = dev / np.sqrt(n)
 
@@ -430,12 +483,14 @@ def oadev(data, rate=1.0, data_type="phase", taus=None):
     """
     phase = input_to_phase(data, rate, data_type)
     (phase, m, taus_used) = tau_generator(phase, rate, taus)
-    ad = np.zeros_like(taus_used)
-    ade = np.zeros_like(taus_used)
-    adn = np.zeros_like(taus_used)
+    ad = np.empty_like(taus_used)
+    ade = np.empty_like(taus_used)
+    adn = np.empty_like(taus_used)
+    scratch = np.empty(len(phase))  # work array, shared by all taus
 
     for idx, mj in enumerate(m):  # stride=1 for overlapping ADEV
-        (ad[idx], ade[idx], adn[idx]) = calc_adev_phase(phase, rate, mj, 1)
+        (ad[idx], ade[idx], adn[idx]) = calc_adev_phase(phase, rate, mj, 1,
+                                                        scratch)
 
     return remove_small_ns(taus_used, ad, ade, adn)
 
@@ -482,14 +537,15 @@ def ohdev(data, rate=1.0, data_type="phase", taus=None):
     """
     phase = input_to_phase(data, rate, data_type)
     (phase, m, taus_used) = tau_generator(phase, rate, taus)
-    hdevs = np.zeros_like(taus_used)
-    hdeverrs = np.zeros_like(taus_used)
-    ns = np.zeros_like(taus_used)
+    hdevs = np.empty_like(taus_used)
+    hdeverrs = np.empty_like(taus_used)
+    ns = np.empty_like(taus_used)
+    scratch = np.empty(len(phase))  # work array, shared by all taus
 
     for idx, mj in enumerate(m):
         (hdevs[idx],
          hdeverrs[idx],
-         ns[idx]) = calc_hdev_phase(phase, rate, mj, 1)
+         ns[idx]) = calc_hdev_phase(phase, rate, mj, 1, scratch)
 
     return remove_small_ns(taus_used, hdevs, hdeverrs, ns)
 
@@ -524,19 +580,21 @@ def hdev(data, rate=1.0, data_type="phase", taus=None):
     """
     phase = input_to_phase(data, rate, data_type)
     (phase, m, taus_used) = tau_generator(phase, rate, taus)
-    hdevs = np.zeros_like(taus_used)
-    hdeverrs = np.zeros_like(taus_used)
-    ns = np.zeros_like(taus_used)
+    hdevs = np.empty_like(taus_used)
+    hdeverrs = np.empty_like(taus_used)
+    ns = np.empty_like(taus_used)
+    scratch = np.empty(len(phase))  # work array, shared by all taus
 
     for idx, mj in enumerate(m):
         (hdevs[idx],
          hdeverrs[idx],
-         ns[idx]) = calc_hdev_phase(phase, rate, mj, mj)  # stride = mj
+         ns[idx]) = calc_hdev_phase(phase, rate, mj, mj,  # stride = mj
+                                    scratch)
 
     return remove_small_ns(taus_used, hdevs, hdeverrs, ns)
 
 
-def calc_hdev_phase(phase, rate, mj, stride):
+def calc_hdev_phase(phase, rate, mj, stride, scratch=None):
     """ main calculation fungtion for HDEV and OHDEV
 
     Parameters
@@ -549,6 +607,9 @@ def calc_hdev_phase(phase, rate, mj, stride):
         M index value for stride
     stride: int
         Size of stride
+    scratch: np.array, optional
+        Work array of at least len(phase) elements. Passing the same
+        array for every tau avoids a new allocation for each call.
 
     Returns
     -------
@@ -578,9 +639,16 @@ def calc_hdev_phase(phase, rate, mj, stride):
 
     n = min(len(d0), len(d1), len(d2), len(d3))
 
-    v_arr = d3[:n] - 3 * d2[:n] + 3 * d1[:n] - d0[:n]
+    # v_arr = d3 - 3*d2 + 3*d1 - d0, computed in-place
+    if scratch is None:
+        scratch = np.empty(n)
+    v_arr = scratch[:n]
+    np.subtract(d1[:n], d2[:n], out=v_arr)
+    v_arr *= 3
+    v_arr += d3[:n]
+    v_arr -= d0[:n]
 
-    s = np.sum(v_arr * v_arr)
+    s = np.dot(v_arr, v_arr)
 
     if n == 0:
         n = 1
@@ -646,28 +714,35 @@ def totdev(data, rate=1.0, data_type="phase", taus=None):
     # check length of new dataset
     assert len(x1)+len(phase)+len(x2) == 3*N - 4
     # Combine into a single array
-    x = np.zeros((3*N - 4))
+    x = np.empty((3*N - 4))
     x[0:N-2] = x1
     x[N-2:2*(N-2)+2] = phase  # original data in the middle
     x[2*(N-2)+2:] = x2
 
-    devs = np.zeros_like(taus_used)
-    deverrs = np.zeros_like(taus_used)
-    ns = np.zeros_like(taus_used)
+    devs = np.empty_like(taus_used)
+    deverrs = np.empty_like(taus_used)
+    ns = np.empty_like(taus_used)
 
     mid = len(x1)
+    # the sum has mid=N-2 terms, for all taus, so one work array
+    # of this size is re-used for the second differences
+    v_arr = np.empty(mid)
+    # constant factors of the normalization 2*(mj*tau0)^2*(N-2)
+    inv_rate2 = 1.0 / (rate * rate)
+    two_nm2 = 2.0 * (N - 2)
 
     for idx, mj in enumerate(m):
-        mj = int(mj)
-        d0 = x[mid + 1:]
-        d1 = x[mid + mj + 1:]
-        d1n = x[mid - mj + 1:]
-        e = min(len(d0), len(d1), len(d1n))
+        d0 = x[mid + 1:2*mid + 1]
+        d1 = x[mid + mj + 1:2*mid + mj + 1]
+        d1n = x[mid - mj + 1:2*mid - mj + 1]
 
-        v_arr = d1n[:e] - 2.0 * d0[:e] + d1[:e]
-        dev = np.sum(v_arr[:mid] * v_arr[:mid])
+        # v_arr = d1n - 2*d0 + d1, computed in-place
+        np.subtract(d1n, d0, out=v_arr)
+        v_arr -= d0
+        v_arr += d1
+        dev = np.dot(v_arr, v_arr)
 
-        dev /= float(2 * pow(mj / rate, 2) * (N - 2))
+        dev /= two_nm2 * (mj * mj) * inv_rate2
         dev = np.sqrt(dev)
         devs[idx] = dev
         deverrs[idx] = dev / np.sqrt(mid)
@@ -727,9 +802,9 @@ def mtotdev(data, rate=1.0, data_type="phase", taus=None):
     phase = input_to_phase(data, rate, data_type)
     (phase, ms, taus_used) = tau_generator(phase, rate, taus,
                                            maximum_m=float(len(phase))/3.0)
-    devs = np.zeros_like(taus_used)
-    deverrs = np.zeros_like(taus_used)
-    ns = np.zeros_like(taus_used)
+    devs = np.empty_like(taus_used)
+    deverrs = np.empty_like(taus_used)
+    ns = np.empty_like(taus_used)
 
     for idx, mj in enumerate(ms):
         devs[idx], deverrs[idx], ns[idx] = calc_mtotdev_phase(phase, rate, mj)
@@ -821,7 +896,8 @@ def calc_mtotdev_phase(phase, rate, m):
                 xmean2 = xmean2 - xstar[m+j-1] + xstar[j+2*m-1]
                 xmean3 = xmean3 - xstar[2*m+j-1] + xstar[j+3*m-1]
 
-            squaresum += pow((xmean1 - 2.0*xmean2 + xmean3)/float(m), 2)
+            v = (xmean1 - 2.0*xmean2 + xmean3)/float(m)
+            squaresum += v*v
 
         squaresum = (1.0/(6.0*m)) * squaresum
         dev += squaresum
@@ -829,7 +905,7 @@ def calc_mtotdev_phase(phase, rate, m):
 
     # scaling in front of double-sum
     assert n == N-3*m+1  # sanity check on the number of terms n
-    dev = dev * 1.0 / (2.0*pow(m*tau0, 2)*(N-3*m+1))
+    dev = dev * 1.0 / (2.0*(m*tau0)*(m*tau0)*(N-3*m+1))
     dev = np.sqrt(dev)
     error = dev / np.sqrt(n)
     return (dev, error, n)
@@ -881,11 +957,10 @@ def htotdev(data, rate=1.0, data_type="phase", taus=None):
     rate = float(rate)
     (freq, ms, taus_used) = tau_generator(freq, rate, taus,
                                           maximum_m=float(len(freq))/3.0)
-    phase = np.array(phase)
-    freq = np.array(freq)
-    devs = np.zeros_like(taus_used)
-    deverrs = np.zeros_like(taus_used)
-    ns = np.zeros_like(taus_used)
+    phase = np.asarray(phase, dtype=np.float64)
+    devs = np.empty_like(taus_used)
+    deverrs = np.empty_like(taus_used)
+    ns = np.empty_like(taus_used)
 
     # NOTE at mj==1 we use ohdev(), based on comment from here:
     # http://www.wriley.com/paper4ht.htm
@@ -894,7 +969,7 @@ def htotdev(data, rate=1.0, data_type="phase", taus=None):
     # FIXME: this uses both freq and phase datasets,
     # which uses double the memory really needed...
     for idx, mj in enumerate(ms):
-        if int(mj) == 1:
+        if mj == 1:
             (devs[idx],
              deverrs[idx],
              ns[idx]) = calc_hdev_phase(phase, rate, mj, 1)
@@ -975,7 +1050,8 @@ def calc_htotdev_freq(freq, m):
                 xmean2 = xmean2 - xstar[m+j-1] + xstar[j+2*m-1]
                 xmean3 = xmean3 - xstar[2*m+j-1] + xstar[j+3*m-1]
 
-            squaresum += pow((xmean1 - 2.0*xmean2 + xmean3)/float(m), 2)
+            v = (xmean1 - 2.0*xmean2 + xmean3)/float(m)
+            squaresum += v*v
 
             k = k+1
         assert k == 6*m  # check number of terms in the sum
@@ -1031,28 +1107,28 @@ def theo1(data, rate=1.0, data_type="phase", taus=None):
     tau0 = 1.0/rate
     (phase, ms, taus_used) = tau_generator(phase, rate, taus, even=True)
 
-    devs = np.zeros_like(taus_used)
-    deverrs = np.zeros_like(taus_used)
-    ns = np.zeros_like(taus_used)
+    devs = np.empty_like(taus_used)
+    deverrs = np.empty_like(taus_used)
+    ns = np.empty_like(taus_used)
 
     N = len(phase)
     for idx, m in enumerate(ms):
-        m = int(m)  # to avoid: VisibleDeprecationWarning: using a
-        # non-integer number instead of an integer will
-        # result in an error in the future
+        m = int(m)  # python int, faster than np.intp in the loops below
         assert m % 2 == 0  # m must be even
+        half = m // 2
         dev = 0
         n = 0
         for i in range(int(N-m)):
             s = 0
-            for d in range(int(m/2)):  # inner sum
-                pre = 1.0 / (float(m)/2 - float(d))
-                s += pre*pow(phase[i]-phase[i-d+int(m/2)] +
-                             phase[i+m]-phase[i+d+int(m/2)], 2)
+            for d in range(half):  # inner sum
+                pre = 1.0 / (half - d)
+                v = (phase[i]-phase[i-d+half] +
+                     phase[i+m]-phase[i+d+half])
+                s += pre*v*v
                 n = n+1
             dev += s
         assert n == (N-m)*m/2  # N-m outer sums, m/2 inner sums
-        dev = dev/(0.75*(N-m)*pow(m*tau0, 2))
+        dev = dev/(0.75*(N-m)*(m*tau0)*(m*tau0))
         # factor 0.75 used here? http://tf.nist.gov/general/pdf/1990.pdf
         # but not here? http://tf.nist.gov/timefreq/general/pdf/2220.pdf
         # (page 29)
@@ -1082,28 +1158,25 @@ def tierms(data, rate=1.0, data_type="phase", taus=None):
 
     """
     phase = input_to_phase(data, rate, data_type)
-    (data, m, taus_used) = tau_generator(phase, rate, taus)
+    (phase, m, taus_used) = tau_generator(phase, rate, taus)
 
     count = len(phase)
 
-    devs = np.zeros_like(taus_used)
-    deverrs = np.zeros_like(taus_used)
-    ns = np.zeros_like(taus_used)
+    devs = np.empty_like(taus_used)
+    deverrs = np.empty_like(taus_used)
+    ns = np.empty_like(taus_used)
 
     for idx, mj in enumerate(m):
-        mj = int(mj)
-
-        # This seems like an unusual way to
-        phases = np.column_stack((phase[:-mj], phase[mj:]))
-        p_max = np.max(phases, axis=1)
-        p_min = np.min(phases, axis=1)
-        phases = p_max - p_min
-        tie = np.sqrt(np.mean(phases * phases))
+        # the time interval error over a window of two points,
+        # max(x_i, x_i+m) - min(x_i, x_i+m) == |x_i+m - x_i|
+        # the sign does not matter, since we square it
+        diff = phase[mj:] - phase[:-mj]
+        tie = np.sqrt(np.dot(diff, diff) / len(diff))
 
         ncount = count - mj
 
         devs[idx] = tie
-        deverrs[idx] = 0 / np.sqrt(ncount)  # TODO! I THINK THIS IS WRONG!
+        deverrs[idx] = tie / np.sqrt(ncount)
         ns[idx] = ncount
 
     return remove_small_ns(taus_used, devs, deverrs, ns)
@@ -1164,46 +1237,57 @@ def mtie(data, rate=1.0, data_type="phase", taus=None):
     this seems to correspond to Stable32 setting "Fast(u)"
     Stable32 also has "Decade" and "Octave" modes where the
     dataset is extended somehow?
+
+    The window maxima and minima are found with a sparse table
+    (range-minimum-query), see [Bregni2001]_.
+    Level k of the table holds max(x[i:i+2^k]) and min(x[i:i+2^k]),
+    and is built from level k-1 by one np.maximum()/np.minimum().
+    A window of w=m+1 points is covered by two overlapping
+    blocks of length 2^k <= w, so all windows for one tau are
+    computed with a few vectorized operations.
+    Since the taus are sorted, only the current level is kept in memory,
+    and the table is built at most once, O(N log N) in total.
     """
     phase = input_to_phase(data, rate, data_type)
     (phase, m, taus_used) = tau_generator(phase, rate, taus)
-    devs = np.zeros_like(taus_used)
-    deverrs = np.zeros_like(taus_used)
-    ns = np.zeros_like(taus_used)
+    devs = np.empty_like(taus_used)
+    deverrs = np.empty_like(taus_used)
+    ns = np.empty_like(taus_used)
+
+    # sparse table level k=0, blocks of one point.
+    # Levels are written alternately into two preallocated buffers,
+    # and the window max/min into two more, so that the loops below
+    # do not allocate new arrays.
+    n = len(phase)
+    k_block = 1
+    n_block = n  # number of blocks at the current level
+    block_max = phase
+    block_min = phase
+    buf_max = (np.empty(n), np.empty(n))
+    buf_min = (np.empty(n), np.empty(n))
+    (win_max, win_min) = (np.empty(n), np.empty(n))
 
     for idx, mj in enumerate(m):
-        try:
-            # the older algorithm uses a lot of memory
-            # but can be used for short datasets.
-            rw = mtie_rolling_window(phase, int(mj + 1))
-            win_max = np.max(rw, axis=1)
-            win_min = np.min(rw, axis=1)
-            tie = win_max - win_min
-            dev = np.max(tie)
-        except ValueError:
-            if int(mj + 1) < 1:
-                raise ValueError("`window` must be at least 1.")
-            if int(mj + 1) > phase.shape[-1]:
-                raise ValueError("`window` is too long.")
-
-            mj = int(mj)
-            currMax = np.max(phase[0:mj])
-            currMin = np.min(phase[0:mj])
-            dev = currMax - currMin
-            for winStartIdx in range(1, int(phase.shape[0] - mj)):
-                winEndIdx = mj + winStartIdx
-                if currMax == phase[winStartIdx - 1]:
-                    currMax = np.max(phase[winStartIdx:winEndIdx])
-                elif currMax < phase[winEndIdx]:
-                    currMax = phase[winEndIdx]
-
-                if currMin == phase[winStartIdx - 1]:
-                    currMin = np.min(phase[winStartIdx:winEndIdx])
-                elif currMin > phase[winEndIdx]:
-                    currMin = phase[winEndIdx]
-
-                if dev < currMax - currMin:
-                    dev = currMax - currMin
+        win_size = mj + 1
+        # build up the table until blocks cover at least half the window
+        while 2 * k_block <= win_size:
+            n_block = n_block - k_block
+            level = k_block.bit_length() % 2  # buffer not holding block_*
+            block_max = np.maximum(block_max[:n_block], block_max[k_block:],
+                                   out=buf_max[level][:n_block])
+            block_min = np.minimum(block_min[:n_block], block_min[k_block:],
+                                   out=buf_min[level][:n_block])
+            k_block = 2 * k_block
+
+        n_win = n - win_size + 1  # number of windows
+        offset = win_size - k_block  # start of second block in window
+        w_max = win_max[:n_win]
+        w_min = win_min[:n_win]
+        np.maximum(block_max[:n_win], block_max[offset:offset + n_win],
+                   out=w_max)
+        np.minimum(block_min[:n_win], block_min[offset:offset + n_win],
+                   out=w_min)
+        dev = np.max(np.subtract(w_max, w_min, out=w_max))
 
         ncount = phase.shape[0] - mj
         devs[idx] = dev
@@ -1326,10 +1410,10 @@ def gradev(data, rate=1.0, data_type="phase", taus=None,
     phase = input_to_phase(data, rate, data_type)
     (data, m, taus_used) = tau_generator(phase, rate, taus)
 
-    ad = np.zeros_like(taus_used)
-    ade_l = np.zeros_like(taus_used)
-    ade_h = np.zeros_like(taus_used)
-    adn = np.zeros_like(taus_used)
+    ad = np.empty_like(taus_used)
+    ade_l = np.empty_like(taus_used)
+    ade_h = np.empty_like(taus_used)
+    adn = np.empty_like(taus_used)
 
     for idx, mj in enumerate(m):
         (dev, deverr, n) = calc_gradev_phase(data,
@@ -1490,7 +1574,7 @@ def psd2allan(S_y, f=1.0, kind='adev', base=2):
         for idx, mj in enumerate(m)])
     integrand = np.insert(integrand, 0, 0.0, axis=1)
     f = np.insert(f, 0, 0.0)
-    ad = np.sqrt(2.0 * simps(integrand, f))
+    ad = np.sqrt(2.0 * simpson(integrand, x=f))
     return taus_used, ad
 
 
@@ -1542,9 +1626,9 @@ def tau_generator(data, rate, taus=None, v=False, even=False, maximum_m=-1):
     (data, m, taus): tuple
         List of computed values
     data: np.array
-        Data
+        Data, as a float64 np.array. Not a copy, if the input already was.
     m: np.array
-        Tau in units of data points
+        Tau in units of data points, as integers
     taus: np.array
         Cleaned up list of tau values
     """
@@ -1557,25 +1641,54 @@ def tau_generator(data, rate, taus=None, v=False, even=False, maximum_m=-1):
     elif isinstance(taus, list) and taus == []:
         taus = "octave"
 
-    if taus is "all":
-        taus = (1.0/rate)*np.linspace(1.0, len(data), len(data))
-    elif taus is "octave":
-        maxn = np.floor(np.log2(len(data)))
+    # no copy is made if data is already a float64 np.array
+    data = np.asarray(data, dtype=np.float64)
+    if not isinstance(taus, str):
+        taus = tuple(np.asarray(taus, dtype=np.float64).ravel())  # hashable
+
+    (m, taus2) = _tau_generator_m(len(data), float(rate), taus,
+                                  even, maximum_m)
+    # return copies, the cached arrays must not be modified by the caller
+    m, taus2 = m.copy(), taus2.copy()
+
+    if v:
+        print("tau_generator: ", m)
+
+    if len(m) == 0:
+        print("Warning: sanity-check on tau failed!")
+        print("   len(data)=", len(data), " rate=", rate, "taus= ", taus)
+
+    return data, m, taus2
+
+
+@functools.lru_cache(maxsize=32)
+def _tau_generator_m(n, rate, taus, even, maximum_m):
+    """ m-list and tau-list for tau_generator() (Helper function)
+
+    Depends only on the length n of the data, not on the data itself.
+    The result is cached, since the same tau-list is usually requested
+    for several statistics of one dataset, or for datasets of equal length
+    as in three_cornered_hat_phase().
+    taus is either one of the keywords "all", "octave", "decade",
+    or a tuple of tau values.
+    """
+    if taus == "all":
+        taus = (1.0/rate)*np.linspace(1.0, n, n)
+    elif taus == "octave":
+        maxn = np.floor(np.log2(n))
         taus = (1.0/rate)*np.logspace(0, int(maxn), int(maxn+1), base=2.0)
-    elif taus is "decade":  # 1, 2, 4, 10, 20, 40, spacing similar to Stable32
-        maxn = np.floor(np.log10(len(data)))
+    elif taus == "decade":  # 1, 2, 4, 10, 20, 40, spacing similar to Stable32
+        maxn = np.floor(np.log10(n))
         taus = []
         for k in range(int(maxn+1)):
             taus.append(1.0*(1.0/rate)*pow(10.0, k))
             taus.append(2.0*(1.0/rate)*pow(10.0, k))
             taus.append(4.0*(1.0/rate)*pow(10.0, k))
 
-    data, taus = np.array(data), np.array(taus)
-    rate = float(rate)
-    m = []  # integer averaging factor. tau = m*tau0
+    taus = np.asarray(taus, dtype=np.float64)
 
     if maximum_m == -1:  # if no limit given
-        maximum_m = len(data)
+        maximum_m = n
     # FIXME: should we use a "stop-ratio" like Stable32
     # found in Table III, page 9 of
     # "Evolution of frequency stability analysis software"
@@ -1596,29 +1709,23 @@ def tau_generator(data, rate, taus=None, v=False, even=False, maximum_m=-1):
     # mtotdev   2
     # ttotdev   2
 
-    taus_valid1 = taus < (1 / float(rate)) * float(len(data))
+    taus_valid1 = taus < (1 / rate) * float(n)
     taus_valid2 = taus > 0
-    taus_valid3 = taus <= (1 / float(rate)) * float(maximum_m)
+    taus_valid3 = taus <= (1 / rate) * float(maximum_m)
     taus_valid = taus_valid1 & taus_valid2 & taus_valid3
-    m = np.floor(taus[taus_valid] * rate)
-    m = m[m != 0]       # m is tau in units of datapoints
+    # m is tau in units of datapoints, an integer
+    m = np.floor(taus[taus_valid] * rate).astype(np.intp)
+    m = m[m != 0]
     m = np.unique(m)    # remove duplicates and sort
 
-    if v:
-        print("tau_generator: ", m)
-
-    if len(m) == 0:
-        print("Warning: sanity-check on tau failed!")
-        print("   len(data)=", len(data), " rate=", rate, "taus= ", taus)
-
-    taus2 = m / float(rate)
+    taus2 = m / rate
 
     if even:  # used by Theo1
         m_even_mask = ((m % 2) == 0)
         m = m[m_even_mask]
         taus2 = taus2[m_even_mask]
 
-    return data, m, taus2
+    return m, taus2
 
 
 def tau_reduction(ms, rate, n_per_decade):
@@ -1654,7 +1761,7 @@ def tau_reduction(ms, rate, n_per_decade):
         Reduced list of tau values
     """
     ms = np.int64(ms)
-    keep = np.bool8(np.rint(n_per_decade*np.log10(ms[1:])) -
+    keep = np.bool_(np.rint(n_per_decade*np.log10(ms[1:])) -
                     np.rint(n_per_decade*np.log10(ms[:-1])))
     # Adjust ms size to fit above-defined mask
     ms = ms[:-1]
@@ -1828,9 +1935,13 @@ def frequency2phase(freqdata, rate):
     # avoid precision issues when we have small frequency fluctuations on
     # a large average frequency
     freqdata = freqdata - np.nanmean(freqdata)
-    phasedata = np.cumsum(freqdata) * dt
-    phasedata = np.insert(phasedata, 0, 0)  # FIXME: why do we do this?
+    # integrate directly into the output array, instead of
+    # cumsum(), scaling, and np.insert() which each make a copy
+    phasedata = np.empty(len(freqdata) + 1)
+    phasedata[0] = 0.0  # FIXME: why do we do this?
     # so that phase starts at zero and len(phase)=len(freq)+1 ??
+    np.cumsum(freqdata, out=phasedata[1:])
+    phasedata[1:] *= dt
     return phasedata
 
 
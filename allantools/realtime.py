@@ -13,6 +13,10 @@
     Version history
     ---------------
 
+    **unreleased**
+    - with fixed afs, keep only the phase history needed by the updates,
+      so memory use does not grow with the length of the stream
+
     **2019.07**
     - Initial release
 
@@ -36,7 +40,8 @@ import numpy
 class dev_realtime(object):
     """ Base-class for real-time statistics """
     def __init__(self, afs=[1], tau0=1.0, auto_afs=False, pts_per_decade=4):
-        self.x = []                         # phase time-series
+        self.x = []                         # phase time-series, newest last
+        self.n = 0                          # number of phase points so far
         self.afs = afs                      # averaging factor, tau = af*tau0
         self.auto_afs = auto_afs
         # logscpace will fail at >=6 (?), need to remove duplicates?
@@ -48,6 +53,21 @@ class dev_realtime(object):
             self.afs = numpy.array([1])
         self.dev = numpy.zeros(len(afs))    # resulting xDEV
         self.tau0 = tau0                     # time-interval between points
+        # the updates use at most the last 3*af+1 phase points,
+        # older points are dropped from x.
+        # In auto-AF mode the next AF needs all of the history.
+        self.history = None
+        if not auto_afs:
+            self.history = 3*max(afs)+1
+
+    def append_phase(self, xnew):
+        """ store new phase point, drop history not needed anymore """
+        self.x.append(xnew)
+        self.n = self.n + 1
+        # trim only when x is twice the needed length,
+        # so that the cost of trimming is O(1) per point
+        if self.history and len(self.x) >= 2*self.history:
+            del self.x[:-self.history]
 
     def update_af(self):
         """ used in auto-AF mode,
@@ -63,7 +83,7 @@ class dev_realtime(object):
         # next possible AF:
         next_af = int(numpy.round(
             pow(10.0, next_decade) * self.af_taus[next_idx]))
-        if len(self.x) >= (2*next_af+1):  # can compute next AF
+        if self.n >= (2*next_af+1):  # can compute next AF
             self.afs = numpy.append(self.afs, next_af)  # new AF
             self.add_af()  # tell subclass to update internal variables
             # FIXME: S defined in subclass!
@@ -108,9 +128,9 @@ class oadev_realtime(dev_realtime):
 
     def add_phase(self, xnew):
         """ add new phase point, in units of seconds """
-        self.x.append(xnew)
+        self.append_phase(xnew)
         for idx, af in enumerate(self.afs):
-            if len(self.x) >= (2*af+1):
+            if self.n >= (2*af+1):
                 self.update_S(idx)
         if self.auto_afs:
             self.update_af()
@@ -118,11 +138,11 @@ class oadev_realtime(dev_realtime):
     def update_S(self, idx):
         """ update S, sum-of-squares """
         af = self.afs[idx]
-        i = len(self.x)-1  # last pt
-        S_new = pow(self.x[i] - 2*self.x[i-af] + self.x[i-2*af], 2)
-        self.S[idx] = self.S[idx] + S_new
+        # indexing from the end, x[-1] is the last pt
+        v = self.x[-1] - 2*self.x[-1-af] + self.x[-1-2*af]
+        self.S[idx] = self.S[idx] + v*v
         self.dev[idx] = numpy.sqrt(
-            (1.0/(2*pow(af*self.tau0, 2)*(i+1-2*af))) * self.S[idx])
+            (1.0/(2*pow(af*self.tau0, 2)*(self.n-2*af))) * self.S[idx])
 
     def add_af(self):
         self.S = numpy.append(self.S, 0)
@@ -147,9 +167,9 @@ class ohdev_realtime(dev_realtime):
 
     def add_phase(self, xnew):
         """ add new phase point """
-        self.x.append(xnew)
+        self.append_phase(xnew)
         for idx, af in enumerate(self.afs):
-            if len(self.x) > 3*af:
+            if self.n > 3*af:
                 self.update_S(idx)
         if self.auto_afs:
             self.update_af()
@@ -157,15 +177,14 @@ class ohdev_realtime(dev_realtime):
     def update_S(self, idx):
         """ update S, sum-of-squares """
         af = self.afs[idx]
-        i = len(self.x)-1  # last pt
-        # print i,self.x
-        S_new = pow(self.x[i] -
-                    3*self.x[i-af] +
-                    3*self.x[i-2*af] -
-                    self.x[i-3*af], 2)
-        self.S[idx] = self.S[idx] + S_new
+        # indexing from the end, x[-1] is the last pt
+        v = (self.x[-1] -
+             3*self.x[-1-af] +
+             3*self.x[-1-2*af] -
+             self.x[-1-3*af])
+        self.S[idx] = self.S[idx] + v*v
         self.dev[idx] = numpy.sqrt(
-            (1.0/(6.0*pow(af*self.tau0, 2)*(i+1.0-3*af))) * self.S[idx])
+            (1.0/(6.0*pow(af*self.tau0, 2)*(self.n-3*af))) * self.S[idx])
 
 
 class tdev_realtime(dev_realtime):
@@ -184,11 +203,11 @@ class tdev_realtime(dev_realtime):
 
     def add_phase(self, xnew):
         """ add new phase point """
-        self.x.append(xnew)
+        self.append_phase(xnew)
         for idx, af in enumerate(self.afs):
-            if len(self.x) >= 3*af+1:  # 3n+1 samples measured
+            if self.n >= 3*af+1:  # 3n+1 samples measured
                 self.update_S(idx)
-            elif len(self.x) >= 2*af+1:  # 2n+1 samples measured
+            elif self.n >= 2*af+1:  # 2n+1 samples measured
                 self.update_S3n(idx)
 
         if self.auto_afs:
@@ -201,16 +220,17 @@ class tdev_realtime(dev_realtime):
     def update_S3n(self, idx):
         """ eqn (13) of paper """
         af = self.afs[idx]
-        j = len(self.x)-1  # last pt
-        self.S[idx] = self.S[idx] + self.x[j] - 2*self.x[j-af] + self.x[j-2*af]
-        if len(self.x) == 3*af:
+        # indexing from the end, x[-1] is the last pt
+        self.S[idx] = (self.S[idx] +
+                       self.x[-1] - 2*self.x[-1-af] + self.x[-1-2*af])
+        if self.n == 3*af:
             # last call to this fctn
             self.So[idx] = pow(self.S[idx], 2)
             self.update_dev(idx)
 
     def update_dev(self, idx):
         # Eqn (14)
-        num_pts = len(self.x)
+        num_pts = self.n
         af = self.afs[idx]
         self.dev[idx] = numpy.sqrt(
             (1.0/6.0)*(1.0/(num_pts-3*af+1.0))*(1.0/pow(af, 2))*(self.So[idx]))
@@ -218,11 +238,10 @@ class tdev_realtime(dev_realtime):
     def update_S(self, idx):
         """ update S, sum-of-squares """
         af = self.afs[idx]
-        assert(len(self.x) >= 3*af+1)
-        i = len(self.x)-1  # last pt
-        # Eqn (12)
-        S_new = (-1*self.x[i-3*af] + 3*self.x[i-2*af] -
-                 3*self.x[i-af] + self.x[i])
+        assert(self.n >= 3*af+1)
+        # Eqn (12), indexing from the end, x[-1] is the last pt
+        S_new = (-1*self.x[-1-3*af] + 3*self.x[-1-2*af] -
+                 3*self.x[-1-af] + self.x[-1])
 
         self.S[idx] = self.S[idx] + S_new
         # Eqn (11)
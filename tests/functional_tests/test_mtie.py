@@ -0,0 +1,24 @@
+#!/usr/bin/python
+import allantools as at
+import numpy as np
+
+N = 257  # not a power of two
+phase = np.cumsum(np.random.randn(N))
+
+
+def mtie_naive(x, m):
+    """ maximum of max-min over all windows of m+1 points """
+    return max(np.max(x[i:i+m+1]) - np.min(x[i:i+m+1])
+               for i in range(len(x) - m))
+
+
+def test_mtie_all_taus():
+    """ compare mtie() against a brute-force computation, for all taus """
+    (taus, devs, errs, ns) = at.mtie(phase, rate=1.0, taus="all")
+    for (tau, dev, n) in zip(taus, devs, ns):
+        m = int(tau)
+        assert np.isclose(dev, mtie_naive(phase, m))
+        assert n == N - m
+
+if __name__ == "__main__":
+    test_mtie_all_taus()
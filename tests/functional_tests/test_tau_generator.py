@@ -54,6 +54,21 @@ def test_tau_generator_numpy1234():
     np.testing.assert_allclose(taus_used, wanted_taus)
 
 
+def test_tau_generator_integer_m():
+    (data, m, taus_used) = at.allantools.tau_generator(d, r, taus="all")
+    assert np.issubdtype(m.dtype, np.integer)
+    np.testing.assert_array_equal(m, np.arange(1, N))
+
+
+def test_tau_generator_cached():
+    (data, m1, taus1) = at.allantools.tau_generator(d, r, taus="octave")
+    expected_m = m1.copy()
+    m1[0] = 0  # must not modify the cached result
+    (data, m2, taus2) = at.allantools.tau_generator(d, r, taus="octave")
+    np.testing.assert_array_equal(m2, expected_m)
+    np.testing.assert_array_equal(taus2, taus1)
+
+
 def test_tau_reduction_10():
     (ms, taus) = at.allantools.tau_reduction(ms=expected_all, rate=r,
                                              n_per_decade=10)
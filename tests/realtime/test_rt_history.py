@@ -0,0 +1,38 @@
+"""
+    Test for allantools (https://github.com/aewallin/allantools)
+
+    Fixed-AF mode: only the phase history needed by the updates is stored,
+    and the result is the same as for the batch computation.
+"""
+import allantools as at
+import numpy
+
+n_pts = pow(2, 12)
+afs = [1, 3, 10, 33]
+x_series = at.noise.white(n_pts)
+
+
+def _test(dev_rt, function):
+    for x in x_series:
+        dev_rt.add_phase(x)
+        assert len(dev_rt.x) < 2*(3*max(afs)+1)
+    (taus, devs, errs, ns) = function(x_series, rate=1.0, taus=afs)
+    numpy.testing.assert_allclose(dev_rt.taus(), taus)
+    numpy.testing.assert_allclose(dev_rt.devs(), devs)
+
+
+def test_oadev_rt_history():
+    _test(at.realtime.oadev_realtime(afs=afs, tau0=1.0), at.oadev)
+
+
+def test_ohdev_rt_history():
+    _test(at.realtime.ohdev_realtime(afs=afs, tau0=1.0), at.ohdev)
+
+
+def test_tdev_rt_history():
+    _test(at.realtime.tdev_realtime(afs=afs, tau0=1.0), at.tdev)
+
+if __name__ == "__main__":
+    test_oadev_rt_history()
+    test_ohdev_rt_history()
+    test_tdev_rt_history()